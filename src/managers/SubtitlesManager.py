@@ -1,5 +1,6 @@
 import asyncio
 from src.subtitles.models import Subtitles, SubtitleSegment, SubtitleWord
+from src.utils.QThrottler import QThrottler
 from logging import getLogger
 logger = getLogger(__name__)
 
@@ -10,6 +11,10 @@ class SubtitlesManager:
     def __init__(self, subtitles: Subtitles = None):
         self._subtitles = subtitles
         self._subtitles_listeners = []
+        self._partial_subtitles_listeners = []
+        self._partial_transcription_id = None
+        self._partial_segments = None
+        self._partial_subtitles_throttler = QThrottler(500)
         logger.info("SubtitlesManager initialized with subtitles: %s", subtitles)
 
     def set_subtitles(self, subtitles: Subtitles):
@@ -22,6 +27,10 @@ class SubtitlesManager:
         """Register a listener to be notified of subtitle changes."""
         self._subtitles_listeners.append(listener)
 
+    def add_partial_subtitles_listener(self, listener):
+        """Register a listener to be notified with a read-only preview of the subtitles still being transcribed."""
+        self._partial_subtitles_listeners.append(listener)
+
     def delete_word(self, segment_index, word_index):
         """Delete a word from a specific segment."""
         del self._subtitles.segments[segment_index].words[word_index]
@@ -80,6 +89,8 @@ class SubtitlesManager:
 
     def on_transcription_changed(self, transcription):
         """Update subtitles based on transcription changes."""
+        # The preview is complete, a throttled update still pending would show it over the final subtitles
+        self._partial_segments = None
 
         async def task():
             self._subtitles = await asyncio.to_thread(Subtitles.from_transcription, transcription)
@@ -87,8 +98,19 @@ class SubtitlesManager:
 
         asyncio.create_task(task())
 
+    def on_partial_transcription(self, partial: dict):
+        """Add a freshly transcribed segment to the preview shown while the rest of the video is transcribed."""
+        if partial["transcription_id"] != self._partial_transcription_id:
+            self._partial_transcription_id = partial["transcription_id"]
+            self._partial_segments = []
+        segment_subtitles = Subtitles.from_transcription({"segments": [partial["segment"]]})
+        self._partial_segments.extend(segment_subtitles.segments)
+        self._partial_subtitles_throttler.call(self._notify_partial_subtitles_listeners)
+
     def on_video_changed(self, video_path):
         self._subtitles = Subtitles.empty()
+        self._partial_transcription_id = None
+        self._partial_segments = None
 
     def _refresh_segment(self, segment_index: int):
         """Refresh a specific segment and notify listeners."""
@@ -106,6 +128,14 @@ class SubtitlesManager:
         for listener in self._subtitles_listeners:
             listener(self._subtitles)
 
+    def _notify_partial_subtitles_listeners(self):
+        """Notify all registered listeners of the segments transcribed so far."""
+        if self._partial_segments is None:
+            return
+        preview = Subtitles(list(self._partial_segments))
+        for listener in self._partial_subtitles_listeners:
+            listener(preview)
+
     @property
     def subtitles(self):
         return self._subtitles
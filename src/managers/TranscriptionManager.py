@@ -1,42 +1,206 @@
 import asyncio
+import os
 import threading
-import whisper
-from src.utils.constants import WHISPER_MODEL
+import av
+import ctranslate2
+import numpy as np
+from dotenv import load_dotenv
+from faster_whisper import BatchedInferencePipeline, WhisperModel, decode_audio
+from faster_whisper.utils import download_model
+from src.utils.constants import WHISPER_MODEL, WHISPER_NUM_WORKERS
+from src.utils.ffmpeg_utils import extract_audio
 from logging import getLogger
 logger = getLogger(__name__)
 
+# Load environment variables from .env file
+load_dotenv()
+
+
+def _select_compute_type(device: str) -> str:
+    """
+    Picks the CTranslate2 compute type for the device. INT8 weights cut memory traffic on CPU;
+    on CUDA FP16 runs the attention GEMMs on tensor cores, older GPUs fall back to what they support.
+
+    Args:
+        device (str): "cuda" or "cpu".
+
+    Returns:
+        str: The compute type.
+    """
+    if device != "cuda":
+        return "int8"
+    try:
+        supported = ctranslate2.get_supported_compute_types("cuda")
+    except Exception:
+        logger.warning("Failed to query CUDA compute types.", exc_info=True)
+        return "default"
+    for compute_type in ("float16", "int8_float16", "int8", "float32"):
+        if compute_type in supported:
+            return compute_type
+    return "default"
+
+
+# Probe the CTranslate2 backend once.
+# WHISPER_COMPUTE_TYPE overrides the choice, e.g. "int8_float16" to shrink the model on small GPUs.
+DEVICE = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE") or _select_compute_type(DEVICE)
+# CTranslate2 releases the GIL, so each worker decodes in parallel on its own share of the cores
+CPU_THREADS = max(1, (os.cpu_count() or 2) // WHISPER_NUM_WORKERS)
+# Silero VAD cuts the audio into speech chunks of at most 30 s, so silence and music are never decoded;
+# the chunks are then decoded in batches, large ones on CUDA to saturate the encoder
+BATCH_SIZE = 16 if DEVICE == "cuda" else 4
+CHUNK_LENGTH_S = 30
+SAMPLE_RATE = 16000
+# The pipeline runs VAD and feature extraction over its whole input before decoding anything, so long audio
+# is fed in windows of this length to be able to stop between them
+DECODE_WINDOW_S = 10 * 60
+# Video changes arriving within this window are coalesced, only the latest one is transcribed
+PENDING_WINDOW_S = 0.2
+# The model is unloaded after this long without transcriptions to give its memory back
+MODEL_IDLE_TIMEOUT_S = 5 * 60
+# On CUDA the unloaded weights are kept in host memory for a fast reload, the copy is dropped
+# after this much more idle time
+MODEL_HOST_COPY_TIMEOUT_S = 30 * 60
+
 
 class TranscriptionManager:
     def __init__(self, whisper_model: str = WHISPER_MODEL):
         self._model = None
+        self._device = DEVICE
+        self._batch_size = BATCH_SIZE
+        self._chunk_length_s = CHUNK_LENGTH_S
         self._model_loading_thread = None
-        self._model_lock = asyncio.Lock()
+        self._transcription_semaphore = asyncio.Semaphore(WHISPER_NUM_WORKERS)
+        self._active_transcriptions = 0
+        self._idle_unload_handle = None
+        self._transcription_count = 0  # Identifies the transcription partial segments belong to
         self._transcription_listeners = []
-        self._model_loaded_event = threading.Event()  # Event to signal model loading completion
+        self._partial_transcription_listeners = []
+        self._model_loaded_event = asyncio.Event()  # Event to signal model loading completion
+        self._loop = None
         self._transcription_process = None
+        self._current_video_path = None
         self._current_audio_path = None
-        self.load_model(whisper_model)
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._pending_task = None
+        self._video_task = None
+        self._model_name = whisper_model  # Loaded lazily on the first transcription
+        self._model_path = None
+        self._model_prefetch_thread = threading.Thread(target=self._prefetch_model, daemon=True)
+        self._model_prefetch_thread.start()
+
+    def _prefetch_model(self) -> None:
+        """
+        Downloads the model files into the local cache while the UI is being built, so the first load
+        only reads them from disk. Cached files are not downloaded again.
+        """
+        try:
+            self._model_path = download_model(self._model_name)
+            logger.info(f"Whisper model files ready: {self._model_path}")
+        except Exception:
+            # Loading retries by name, which surfaces the error if the model is really unavailable
+            logger.warning("Failed to prefetch Whisper model files", exc_info=True)
 
     def load_model(self, whisper_model: str) -> None:
         """
-        Loads the Whisper model in a separate thread.
+        Loads the Whisper model in a separate thread. Must be called from the running event loop.
         """
+        self._loop = asyncio.get_running_loop()
 
         def worker():
             try:
+                if self._model is not None and whisper_model == self._model_name:
+                    # The weights were offloaded to host memory, copying them back skips reading and converting
+                    # the checkpoint from disk again
+                    logger.info("Restoring Whisper model from host memory...")
+                    # On failure (e.g. out of VRAM) the handler below drops the model, the next load reads it from disk
+                    self._model.model.load_model()
+                    logger.info("Whisper model restored successfully.")
+                    self._loop.call_soon_threadsafe(self._model_loaded_event.set)
+                    return
+
                 logger.info("Loading Whisper model...")
-                self._model = whisper.load_model(whisper_model)
+                model_path = whisper_model
+                if whisper_model == self._model_name:
+                    self._model_prefetch_thread.join()
+                    model_path = self._model_path or whisper_model
+                try:
+                    self._model = self._create_model(model_path, DEVICE, COMPUTE_TYPE)
+                except Exception:
+                    if DEVICE != "cuda":
+                        raise
+                    # A CUDA driver does not guarantee the cuBLAS/cuDNN libraries CTranslate2 needs
+                    logger.warning("Failed to load Whisper model on CUDA, falling back to CPU.", exc_info=True)
+                    self._model = self._create_model(model_path, "cpu", "int8")
                 logger.info("Whisper model loaded successfully.")
-                self._model_loaded_event.set()  # Signal that the model is loaded
+                self._loop.call_soon_threadsafe(self._model_loaded_event.set)  # Signal that the model is loaded
             except Exception as e:
                 logger.exception("Failed to load Whisper model")
-                self._model_loaded_event.set()  # Ensure the event is set even on failure
+                self._model = None
+                self._loop.call_soon_threadsafe(self._on_model_load_failed)
                 raise RuntimeError(f"Failed to load model: {e}") from e
 
         # Start the worker in a separate thread
         self._model_loading_thread = threading.Thread(target=worker, daemon=True)
         self._model_loading_thread.start()
 
+    def _create_model(self, model_path: str, device: str, compute_type: str) -> WhisperModel:
+        """
+        Creates the faster-whisper model on the given device. On CUDA one encoder pass is run, so missing
+        CUDA libraries fail here rather than on the first transcription.
+
+        Args:
+            model_path (str): Model name or path to the converted model directory.
+            device (str): "cuda" or "cpu".
+            compute_type (str): CTranslate2 compute type.
+
+        Returns:
+            WhisperModel: The loaded model.
+        """
+        model = WhisperModel(
+            model_path,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=CPU_THREADS,
+            num_workers=WHISPER_NUM_WORKERS,
+        )
+        if device == "cuda":
+            features = np.zeros((1, model.model.n_mels, model.feature_extractor.nb_max_frames), dtype=np.float32)
+            model.model.encode(ctranslate2.StorageView.from_array(features))
+        self._device = device
+        self._batch_size = BATCH_SIZE if device == DEVICE else 4
+        return model
+
+    def _on_model_load_failed(self) -> None:
+        """
+        Wakes up the callers waiting for the model, then resets the loading state so the next
+        transcription tries to load the model again.
+        """
+        self._model_loaded_event.set()
+        # Waiters already woken by set() are not affected by clear()
+        self._model_loaded_event.clear()
+        self._model_loading_thread = None
+
+    def unload_model(self) -> None:
+        """
+        Releases the Whisper model so its memory can be reclaimed. It is loaded again on the next transcription.
+        On CUDA the weights are moved to host memory instead, freeing the VRAM while keeping the reload fast,
+        and are released by the next call, scheduled MODEL_HOST_COPY_TIMEOUT_S later.
+        """
+        if self._active_transcriptions or (self._model_loading_thread and self._model_loading_thread.is_alive()):
+            logger.info("Whisper model is busy, skipping unload.")
+            return
+
+        if self._device == "cuda" and self._model is not None and self._model.model.model_is_loaded:
+            self._model.model.unload_model(to_cpu=True)
+            # The host copy takes as much RAM as the weights, so it is not kept forever either
+            self._idle_unload_handle = self._loop.call_later(MODEL_HOST_COPY_TIMEOUT_S, self.unload_model)
+        else:
+            self._model = None
+        self._model_loading_thread = None
+        self._model_loaded_event.clear()
+        logger.info("Whisper model unloaded.")
+
     async def transcribe(self, audio_path: str, word_timestamps: bool = True, language: str = None) -> dict | None:
         """
         Asynchronously transcribes an audio file to text using the Whisper model.
@@ -44,51 +208,242 @@ class TranscriptionManager:
         Args:
             audio_path (str): Path to the input audio file.
             word_timestamps (bool): Whether to include word-level timestamps.
+            language (str): Language code, or None to auto-detect.
 
         Returns:
-            dict: Transcription result.
+            dict | None: Transcription result, or None if the audio changed in the meantime.
         """
-        # Wait for the model to load
-        await asyncio.to_thread(self._model_loaded_event.wait)
+        return await self._run_transcription(
+            audio_path, word_timestamps, language, is_stale=lambda: self._current_audio_path != audio_path
+        )
 
-        if not self._model:
-            raise RuntimeError("Model is not loaded. Cannot transcribe.")
+    async def transcribe_array(
+            self, samples: np.ndarray, sr: int = SAMPLE_RATE, word_timestamps: bool = True, language: str = None
+    ) -> dict | None:
+        """
+        Asynchronously transcribes already decoded mono PCM samples, skipping the ffmpeg decode of a file.
 
-        async with self._model_lock:
-            if self._current_audio_path != audio_path:
-                return
-            try:
-                logger.info(f"Starting transcription for {audio_path}...")
-                transcription = await asyncio.to_thread(
-                    self._model.transcribe, audio_path, word_timestamps=word_timestamps, language=language
+        Args:
+            samples (np.ndarray): Mono audio samples.
+            sr (int): Sample rate of the samples.
+            word_timestamps (bool): Whether to include word-level timestamps.
+            language (str): Language code, or None to auto-detect.
+
+        Returns:
+            dict | None: Transcription result.
+        """
+        audio = np.asarray(samples, dtype=np.float32)
+        if sr != SAMPLE_RATE:
+            audio = _resample(audio, sr, SAMPLE_RATE)
+        return await self._run_transcription(audio, word_timestamps, language, is_stale=lambda: False)
+
+    async def _run_transcription(
+            self, audio: str | np.ndarray, word_timestamps: bool, language: str | None, is_stale: callable
+    ) -> dict | None:
+        """
+        Loads the model if needed, transcribes the audio and notifies listeners with the result.
+
+        Args:
+            audio (str | np.ndarray): Path to an audio file or 16 kHz mono samples.
+            word_timestamps (bool): Whether to include word-level timestamps.
+            language (str | None): Language code, or None to auto-detect.
+            is_stale (callable): Returns True when the result is no longer wanted.
+
+        Returns:
+            dict | None: Transcription result, or None if it became stale.
+        """
+        # Counted from the start, so the model is not unloaded under a caller still waiting for its turn
+        self._active_transcriptions += 1
+        if self._idle_unload_handle:
+            self._idle_unload_handle.cancel()
+            self._idle_unload_handle = None
+        try:
+            if self._model_loading_thread is None:
+                self.load_model(self._model_name)
+
+            # Wait for the model to load
+            await self._model_loaded_event.wait()
+
+            if not self._model:
+                raise RuntimeError("Model is not loaded. Cannot transcribe.")
+
+            async with self._transcription_semaphore:
+                if is_stale():
+                    return None
+                try:
+                    source = audio if isinstance(audio, str) else f"{len(audio) / SAMPLE_RATE:.1f}s of samples"
+                    logger.info(f"Starting transcription for {source}...")
+                    self._transcription_count += 1
+                    transcription_id = self._transcription_count
+                    audio_path = audio if isinstance(audio, str) else None
+                    # Segments are handed over from the decode thread as soon as they are finished
+                    loop = asyncio.get_running_loop()
+                    partial_segments = asyncio.Queue()
+                    abandoned = False
+                    decode = asyncio.ensure_future(asyncio.to_thread(
+                        self._transcribe_sync, audio, word_timestamps, language,
+                        lambda: abandoned or is_stale(),
+                        lambda segment: loop.call_soon_threadsafe(partial_segments.put_nowait, segment)
+                    ))
+                    decode.add_done_callback(lambda _: partial_segments.put_nowait(None))
+                    try:
+                        while (segment := await partial_segments.get()) is not None:
+                            if not is_stale():
+                                await self._emit_partial(transcription_id, audio_path, segment)
+                    except BaseException:
+                        # Stop the decode thread and collect its outcome before giving up the worker slot
+                        abandoned = True
+                        await asyncio.gather(decode, return_exceptions=True)
+                        raise
+                    transcription = await decode
+                    if transcription is None or is_stale():
+                        logger.info("Transcription cancelled, the audio changed.")
+                        return None
+                    logger.info("Transcription completed successfully.")
+                    await self.notify_listeners(transcription)
+                    return transcription
+                except Exception as e:
+                    # Logged by the caller, the video queue logs each failed video once
+                    raise RuntimeError(f"Transcription failed: {e}") from e
+        finally:
+            self._active_transcriptions -= 1
+            if not self._active_transcriptions:
+                self._idle_unload_handle = asyncio.get_running_loop().call_later(
+                    MODEL_IDLE_TIMEOUT_S, self.unload_model
                 )
-                if self._current_audio_path != audio_path:
-                    return
-                logger.info("Transcription completed successfully.")
-                self.notify_listeners(transcription)
-            except Exception as e:
-                logger.exception("Transcription failed")
-                raise RuntimeError(f"Transcription failed: {e}") from e
 
-    def notify_listeners(self, transcription: dict) -> None:
+    def _transcribe_sync(
+            self,
+            audio: str | np.ndarray,
+            word_timestamps: bool,
+            language: str | None,
+            is_stale: callable,
+            on_segment: callable
+    ) -> dict | None:
+        """
+        Runs the blocking faster-whisper decode and shapes the result like the reference Whisper output.
+
+        Args:
+            audio (str | np.ndarray): Path to an audio file or 16 kHz mono samples.
+            word_timestamps (bool): Whether to include word-level timestamps.
+            language (str | None): Language code, or None to auto-detect.
+            is_stale (callable): Returns True when the result is no longer wanted.
+            on_segment (callable): Called from the decode thread with each finished segment.
+
+        Returns:
+            dict | None: Transcription result with "text", "segments" and "language" keys,
+            or None if the decode was abandoned.
+        """
+        if isinstance(audio, str):
+            audio = decode_audio(audio, sampling_rate=SAMPLE_RATE)
+        # The pipeline keeps per-call decoding state, so each concurrent call gets its own wrapper
+        pipeline = BatchedInferencePipeline(model=self._model)
+        window = DECODE_WINDOW_S * SAMPLE_RATE
+        dict_segments = []
+        for offset in range(0, len(audio), window):
+            if is_stale():
+                return None
+            segments, info = pipeline.transcribe(
+                audio[offset:offset + window],
+                word_timestamps=word_timestamps,
+                language=language,
+                batch_size=self._batch_size,
+                chunk_length=self._chunk_length_s,
+                vad_filter=True,
+            )
+            # Detected once, on the first window
+            language = info.language
+            # The segments are produced lazily, so the decode happens while consuming the generator
+            # and stopping early skips the rest of the window
+            for segment in segments:
+                if is_stale():
+                    return None
+                dict_segment = self._segment_to_dict(segment, offset / SAMPLE_RATE)
+                dict_segment["id"] = len(dict_segments) + 1
+                dict_segments.append(dict_segment)
+                on_segment(dict_segment)
+        return {
+            "text": "".join(segment["text"] for segment in dict_segments),
+            "segments": dict_segments,
+            "language": language,
+        }
+
+    @staticmethod
+    def _segment_to_dict(segment, offset: float = 0.0) -> dict:
+        """
+        Converts a faster-whisper segment into the dictionary schema used by the reference Whisper.
+
+        Args:
+            segment: A faster_whisper.transcribe.Segment instance.
+            offset (float): Seconds to add to the timestamps, for segments of a window of the audio.
+
+        Returns:
+            dict: The segment as a dictionary.
+        """
+        dict_segment = {
+            "id": segment.id,
+            "start": round(segment.start + offset, 3),
+            "end": round(segment.end + offset, 3),
+            "text": segment.text,
+            "avg_logprob": segment.avg_logprob,
+            "no_speech_prob": segment.no_speech_prob,
+        }
+        if segment.words is not None:
+            dict_segment["words"] = [
+                {
+                    "word": word.word,
+                    "start": round(word.start + offset, 3),
+                    "end": round(word.end + offset, 3),
+                    "probability": word.probability,
+                }
+                for word in segment.words
+            ]
+        return dict_segment
+
+    async def notify_listeners(self, transcription: dict) -> None:
         """
         Notify all registered listeners with the transcription result.
 
         Args:
             transcription: The transcription result to pass to listeners.
         """
-        for listener in self._transcription_listeners:
-            listener(transcription)
+        await _dispatch(self._transcription_listeners, transcription)
+
+    async def _emit_partial(self, transcription_id: int, audio_path: str | None, segment: dict) -> None:
+        """
+        Notify partial transcription listeners with a finished segment while the rest is still being decoded.
+
+        Args:
+            transcription_id (int): Identifies the transcription the segment belongs to. Segment ids restart
+                with every transcription, so listeners use it to tell a new transcription apart.
+            audio_path (str | None): Path of the transcribed audio, or None for in-memory samples.
+            segment (dict): The segment, in the same schema as the entries of the transcription's "segments".
+        """
+        await _dispatch(self._partial_transcription_listeners, {
+            "transcription_id": transcription_id,
+            "audio_path": audio_path,
+            "segment": segment,
+        })
 
     def add_transcription_listener(self, listener):
         """
         Adds a listener to be notified when transcription is complete.
 
         Args:
-            listener (callable): A coroutine function to call with the transcription result.
+            listener (callable): A function or coroutine function to call with the transcription result.
         """
         self._transcription_listeners.append(listener)
 
+    def add_partial_transcription_listener(self, listener):
+        """
+        Adds a listener to be notified with each segment as soon as it is transcribed.
+
+        Args:
+            listener (callable): A function or coroutine function to call with a dictionary holding
+                the "transcription_id", "audio_path" and "segment".
+        """
+        self._partial_transcription_listeners.append(listener)
+
     def on_video_changed(self, video_path: str):
         """
         Called when the video changes. Can be used to reset or update the transcription manager.
@@ -96,5 +451,112 @@ class TranscriptionManager:
         Args:
             video_path (str): Path to the new video file.
         """
-        self._current_audio_path = video_path
-        asyncio.create_task(self.transcribe(video_path))
+        self._current_video_path = video_path
+        self._current_audio_path = None
+        self._enqueue(video_path)
+
+    def _enqueue(self, video_path: str) -> asyncio.Future:
+        """
+        Queues a video for transcription, cancelling the one in progress. Requests are collected
+        for PENDING_WINDOW_S before being processed.
+
+        Args:
+            video_path (str): Path to the video file.
+
+        Returns:
+            asyncio.Future: Resolves to the transcription, or None if a newer video superseded this one.
+        """
+        if self._video_task is not None:
+            # Stop extracting or decoding the previous video instead of waiting for it to finish
+            self._video_task.cancel()
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((video_path, future))
+        if self._pending_task is None or self._pending_task.done():
+            self._pending_task = asyncio.create_task(self._process_pending())
+        return future
+
+    async def _process_pending(self) -> None:
+        """
+        Drains the pending queue, transcribing only the most recent video of each window.
+        """
+        while self._pending:
+            await asyncio.sleep(PENDING_WINDOW_S)
+            pending, self._pending = self._pending, []
+            *superseded, (video_path, future) = pending
+            for _, superseded_future in superseded:
+                superseded_future.set_result(None)
+            self._video_task = asyncio.create_task(self._transcribe_video(video_path))
+            await asyncio.wait([self._video_task])
+            if self._video_task.cancelled():
+                future.set_result(None)
+            elif (error := self._video_task.exception()) is not None:
+                # on_video_changed does not await the future, so the error would otherwise go unnoticed
+                logger.error(f"Failed to transcribe {video_path}", exc_info=error)
+                future.set_exception(error)
+                # Mark the error as retrieved, it is logged above and the future is usually dropped
+                future.exception()
+            else:
+                future.set_result(self._video_task.result())
+
+    async def _transcribe_video(self, video_path: str) -> dict | None:
+        """
+        Extracts (or reuses the cached) 16 kHz mono audio of the video and transcribes it.
+
+        Args:
+            video_path (str): Path to the video file.
+
+        Returns:
+            dict | None: Transcription result, or None if the video changed in the meantime.
+        """
+        audio_path = await extract_audio(video_path, SAMPLE_RATE)
+        if self._current_video_path != video_path:
+            return None
+        self._current_audio_path = audio_path
+        return await self.transcribe(audio_path)
+
+
+async def _dispatch(listeners: list[callable], payload) -> None:
+    """
+    Call every listener with the payload. Coroutine listeners run concurrently, so a slow listener
+    does not hold back the others.
+
+    Args:
+        listeners (list[callable]): Functions or coroutine functions to call.
+        payload: The value to pass to each listener.
+    """
+    coroutine_listeners = []
+    for listener in listeners:
+        if asyncio.iscoroutinefunction(listener):
+            coroutine_listeners.append(listener)
+        else:
+            # Plain listeners run on the event loop thread since they may schedule tasks on it
+            listener(payload)
+    # The coroutines are only created once every plain listener returned, so an error in one of those
+    # does not leave them unawaited
+    await asyncio.gather(*(listener(payload) for listener in coroutine_listeners))
+
+
+def _resample(samples: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+    """
+    Resamples mono audio with FFmpeg's low-pass filtered resampler, the same one faster-whisper uses
+    when it decodes files, so content above the target Nyquist frequency does not alias into speech.
+
+    Args:
+        samples (np.ndarray): Mono float32 audio samples.
+        orig_sr (int): Sample rate of the samples.
+        target_sr (int): Desired sample rate.
+
+    Returns:
+        np.ndarray: The resampled float32 samples.
+    """
+    if not samples.size:
+        # PyAV cannot allocate a frame without samples
+        return np.zeros(0, dtype=np.float32)
+    frame = av.AudioFrame.from_ndarray(np.ascontiguousarray(samples).reshape(1, -1), format="flt", layout="mono")
+    frame.sample_rate = orig_sr
+    resampler = av.AudioResampler(format="flt", layout="mono", rate=target_sr)
+    # Passing None flushes the samples still buffered in the resampler
+    frames = resampler.resample(frame) + resampler.resample(None)
+    if not frames:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate([resampled.to_ndarray().reshape(-1) for resampled in frames])
@@ -1,6 +1,6 @@
 import os
 from PySide6.QtGui import QCloseEvent, QShowEvent
-from PySide6.QtWidgets import QWidget, QVBoxLayout
+from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout
 from logging import getLogger
 from dotenv import load_dotenv
 
@@ -14,10 +14,74 @@ if os.path.isdir(dll_directory):
 else:
     # Using print here as logger might not be configured this early.
     print(f"WARNING: MPV DLL directory not found: {dll_directory}. MPV initialization may fail.")
-from mpv import MPV
+from mpv import MPV, MpvEventEndFile
 
 logger = getLogger(__name__)
 
+# MPV is created once per session and shared by every MediaPlayer, so closing and reopening a player
+# does not pay for decoder, hwdec context and shader cache initialization again
+_MPV_SINGLETON: MPV = None
+# Path of the last file handed to MPV, so asynchronous load errors can name it
+_requested_media_path: str = None
+
+
+def _get_mpv(wid: str) -> MPV:
+    """
+    Return the shared MPV instance attached to the given window, creating it on first use.
+
+    Args:
+        wid (str): The window ID MPV renders into.
+
+    Returns:
+        MPV: The shared MPV instance.
+    """
+    global _MPV_SINGLETON
+    if _MPV_SINGLETON is not None:
+        # mpv only reads wid when it creates the video output, so take the video track down and
+        # back up around the change to make it render into the new window
+        _MPV_SINGLETON.vid = 'no'
+        _MPV_SINGLETON['wid'] = wid
+        _MPV_SINGLETON.vid = 'auto'
+        return _MPV_SINGLETON
+
+    _MPV_SINGLETON = MPV(
+        wid=wid,
+        loglevel=os.getenv("MPV_LOGLEVEL", "warn"),
+        keep_open='yes',
+        hwdec='auto-safe'  # Decode video on the GPU when a safe hardware decoder is available
+    )
+    _MPV_SINGLETON.event_callback('end-file')(_on_end_file)
+    QApplication.instance().aboutToQuit.connect(_terminate_mpv)
+    return _MPV_SINGLETON
+
+
+def _terminate_mpv() -> None:
+    """
+    Terminate the shared MPV instance when the application quits.
+    """
+    global _MPV_SINGLETON
+    if _MPV_SINGLETON is None:
+        return
+    try:
+        _MPV_SINGLETON.terminate()
+        logger.info("MPV player terminated.")
+    except Exception as e:
+        logger.error(f"Error during MPV termination: {e}", exc_info=True)
+    finally:
+        _MPV_SINGLETON = None
+
+
+def _on_end_file(event) -> None:
+    """
+    Report files MPV failed to open. Called from the MPV event thread.
+
+    Args:
+        event: The MPV end-file event.
+    """
+    data = event.data
+    if data is not None and data.reason == MpvEventEndFile.ERROR:
+        logger.error(f"MPV failed to load media: {_requested_media_path} (error code {data.error}).")
+
 
 class MediaPlayer(QWidget):
     """
@@ -57,11 +121,7 @@ class MediaPlayer(QWidget):
 
         try:
             logger.debug(f"Initializing MPV with wid: {wid_val}")
-            self.player = MPV(
-                wid=str(wid_val),
-                loglevel="debug",
-                keep_open='yes'
-            )
+            self.player = _get_mpv(str(wid_val))
             self.mpv_initialized = True
             logger.info("MPV player initialized successfully.")
             return True
@@ -99,7 +159,7 @@ class MediaPlayer(QWidget):
         if not self._ensure_player_ready():
             return
 
-        if not subtitle_path or not os.path.exists(subtitle_path):
+        if not subtitle_path:
             logger.warning(f"Invalid subtitle path: {subtitle_path}.")
             return
 
@@ -115,7 +175,7 @@ class MediaPlayer(QWidget):
             self.player.command('sub_reload')
             logger.info("Subtitles set and reloaded.")
         except Exception as e:
-            logger.error(f"Failed to set subtitles: {e}", exc_info=True)
+            logger.error(f"Failed to set subtitles {subtitle_path}: {e}", exc_info=True)
 
     def set_media(self, video_path: str, subtitle_path: str = None):
         """
@@ -125,16 +185,18 @@ class MediaPlayer(QWidget):
             video_path (str): Path to the video file.
             subtitle_path (str, optional): Path to the subtitle file.
         """
+        global _requested_media_path
         if not self._ensure_player_ready():
             return
 
-        if not video_path or not os.path.exists(video_path):
+        if not video_path:
             logger.warning(f"Invalid video path: {video_path}.")
             return
 
         logger.info(f"Setting media: {video_path}, subtitles: {subtitle_path}")
         try:
             self.pause()
+            _requested_media_path = video_path
             self.player.loadfile(video_path, mode='replace')
 
             if subtitle_path:
@@ -217,7 +279,8 @@ class MediaPlayer(QWidget):
 
     def closeEvent(self, event: QCloseEvent):
         """
-        Handle widget close event to release MPV resources.
+        Handle widget close event by pausing and detaching the shared MPV instance from this widget.
+        MPV itself is only terminated when the application quits.
 
         Args:
             event: The close event.
@@ -225,10 +288,13 @@ class MediaPlayer(QWidget):
         logger.info("Closing MediaPlayer.")
         if self.player:
             try:
-                self.player.terminate()
-                logger.info("MPV player terminated.")
+                self.pause()
+                # Destroy the video output before detaching, it would otherwise keep rendering into this window
+                self.player.vid = 'no'
+                self.player['wid'] = '-1'  # mpv's "no window" value
+                logger.info("MPV player detached.")
             except Exception as e:
-                logger.error(f"Error during MPV termination: {e}", exc_info=True)
+                logger.error(f"Error while detaching MPV: {e}", exc_info=True)
             finally:
                 self.player = None
                 self.mpv_initialized = False
@@ -40,6 +40,7 @@ class SubtitleEditorApp(QWidget):
         self.video_manager.add_video_listener(self.transcription_manager.on_video_changed)
         self.video_manager.add_video_listener(self.subtitles_manager.on_video_changed)
         self.transcription_manager.add_transcription_listener(self.subtitles_manager.on_transcription_changed)
+        self.transcription_manager.add_partial_transcription_listener(self.subtitles_manager.on_partial_transcription)
 
     def _initialize_ui(self):
         """Initialize the UI components."""
@@ -14,6 +14,7 @@ class SubtitlesLayout(QVBoxLayout):
         self.subtitles_manager = subtitles_manager
         video_manager.add_video_listener(self.on_video_changed)
         subtitles_manager.add_subtitles_listener(self.on_subtitles_changed)
+        subtitles_manager.add_partial_subtitles_listener(self.on_partial_subtitles_changed)
 
         self.segment_list = QListWidget()
         self.segment_list.itemSelectionChanged.connect(self.load_words_for_segment)
@@ -153,7 +154,14 @@ class SubtitlesLayout(QVBoxLayout):
             text = f"{i + 1}. [{segment.start:.2f}-{segment.end:.2f}] {str(segment)}"
             self.segment_list.addItem(text)
 
+    def on_partial_subtitles_changed(self, subtitles: Subtitles):
+        # Only a preview, editing is enabled once the final transcription arrives
+        self.segment_list.setDisabled(True)
+        self.word_tree.clear()
+        self.update_segment_list(subtitles)
+
     def on_subtitles_changed(self, subtitles: Subtitles):
+        self.segment_list.setDisabled(False)
         self.update_segment_list(subtitles)
         self.load_words_for_segment()
 
@@ -10,6 +10,7 @@ logger = getLogger(__name__)
 APP_NAME = "AutoSubs"
 COMPANY_NAME = "GithubOzzy420"
 WHISPER_MODEL = "turbo"
+WHISPER_NUM_WORKERS = 2  # Transcriptions that may run in parallel on one loaded model
 
 # Define paths
 TEMP_DIR: Path = Path(tempfile.gettempdir()) / APP_NAME
@@ -1,3 +1,6 @@
+import asyncio
+import contextlib
+import hashlib
 import json
 import subprocess
 import os
@@ -102,6 +105,75 @@ def get_video_duration(video_path: str) -> float:
         raise RuntimeError(f"Failed to retrieve video duration: {e}")
 
 
+async def extract_audio(video_path: str, sample_rate: int = 16000) -> str:
+    """
+    Extracts the audio track of a video to a mono WAV file. The file is cached in TEMP_DIR,
+    keyed by the video content, so repeated transcriptions of the same video skip the decode.
+
+    Args:
+        video_path (str): Path to the video file.
+        sample_rate (int): Sample rate of the extracted audio.
+
+    Returns:
+        str: Absolute path to the WAV file.
+
+    Raises:
+        RuntimeError: If ffmpeg fails to extract the audio.
+    """
+    key = await asyncio.to_thread(_content_key, video_path)
+    output_path = os.path.join(TEMP_DIR, f"{key}.{sample_rate // 1000}k.wav")
+    if os.path.exists(output_path):
+        logger.info(f"Using cached audio for {video_path}: {output_path}")
+        return output_path
+
+    # Write to a temporary name first so an interrupted extraction is never picked up from the cache
+    partial_path = f"{output_path}.part"
+    cmd = [
+        "ffmpeg", "-y", "-nostdin",
+        "-i", _adjust_path(video_path),
+        "-vn", "-ac", "1", "-ar", str(sample_rate),
+        "-f", "wav",
+        _adjust_path(partial_path)
+    ]
+    logger.info(f"Extracting audio with command: {' '.join(cmd)}")
+    process = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE, cwd=TEMP_DIR
+    )
+    try:
+        _, stderr = await process.communicate()
+    except asyncio.CancelledError:
+        # The video is no longer wanted, stop decoding it
+        with contextlib.suppress(ProcessLookupError):
+            process.kill()
+        await process.wait()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(partial_path)
+        raise
+    if process.returncode != 0:
+        logger.error(f"Failed to extract audio: {stderr.decode(errors='replace')}")
+        raise RuntimeError(f"FFmpeg audio extraction failed with exit code {process.returncode}")
+
+    os.replace(partial_path, output_path)
+    return os.path.abspath(output_path)
+
+
+def _content_key(path: str, sample_size: int = 1 << 20) -> str:
+    """
+    Computes a short cache key from the file size and the first `sample_size` bytes of the file.
+
+    Args:
+        path (str): Path to the file.
+        sample_size (int): Number of leading bytes to hash.
+
+    Returns:
+        str: Hexadecimal cache key.
+    """
+    digest = hashlib.blake2b(str(os.path.getsize(path)).encode())
+    with open(path, 'rb') as file:
+        digest.update(file.read(sample_size))
+    return digest.hexdigest()[:16]
+
+
 def _adjust_path(path: str, cwd: str = TEMP_DIR) -> str:
     """
     Adjusts the provided path relative to the given `cwd` directory and normalizes path separators.
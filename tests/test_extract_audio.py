@@ -0,0 +1,81 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.utils.constants import TEMP_DIR
+from src.utils.ffmpeg_utils import _content_key, extract_audio
+
+
+class TestExtractAudio(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        video = tempfile.NamedTemporaryFile(suffix=".mp4", delete=False)
+        video.write(b"fake video content")
+        video.close()
+        self.video_path = video.name
+        self.output_path = os.path.join(TEMP_DIR, f"{_content_key(self.video_path)}.16k.wav")
+        self.addCleanup(self._remove, self.video_path, self.output_path, f"{self.output_path}.part")
+
+    @staticmethod
+    def _remove(*paths):
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_content_key_depends_on_content(self):
+        key = _content_key(self.video_path)
+        self.assertEqual(key, _content_key(self.video_path))
+        with open(self.video_path, 'ab') as file:
+            file.write(b"more")
+        self.assertNotEqual(key, _content_key(self.video_path))
+
+    async def test_cache_hit_skips_ffmpeg(self):
+        with open(self.output_path, 'wb') as file:
+            file.write(b"cached")
+
+        with patch("asyncio.create_subprocess_exec") as create_subprocess_exec:
+            result = await extract_audio(self.video_path)
+
+        create_subprocess_exec.assert_not_called()
+        self.assertEqual(os.path.abspath(result), os.path.abspath(self.output_path))
+
+    async def test_extraction_renames_partial_file(self):
+        async def fake_ffmpeg(*cmd, cwd, **kwargs):
+            # The output path is the last argument, relative to the working directory
+            with open(os.path.join(cwd, cmd[-1]), 'wb') as file:
+                file.write(b"wav")
+            return MagicMock(returncode=0, communicate=AsyncMock(return_value=(None, b"")))
+
+        with patch("asyncio.create_subprocess_exec", side_effect=fake_ffmpeg):
+            result = await extract_audio(self.video_path)
+
+        self.assertEqual(os.path.abspath(result), os.path.abspath(self.output_path))
+        self.assertTrue(os.path.exists(self.output_path))
+        self.assertFalse(os.path.exists(f"{self.output_path}.part"))
+
+
+    async def test_cancellation_kills_ffmpeg(self):
+        communicate_started = asyncio.Event()
+
+        async def communicate():
+            communicate_started.set()
+            await asyncio.Event().wait()  # Never finishes unless cancelled
+
+        process = MagicMock(returncode=None, communicate=communicate, wait=AsyncMock())
+        with open(f"{self.output_path}.part", 'wb') as file:
+            file.write(b"partial wav")
+
+        with patch("asyncio.create_subprocess_exec", AsyncMock(return_value=process)):
+            task = asyncio.create_task(extract_audio(self.video_path))
+            await communicate_started.wait()
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        process.kill.assert_called_once()
+        process.wait.assert_awaited_once()
+        self.assertFalse(os.path.exists(f"{self.output_path}.part"))
+
+if __name__ == '__main__':
+    unittest.main()
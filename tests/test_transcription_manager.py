@@ -0,0 +1,293 @@
+import asyncio
+import gc
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+
+from src.managers.TranscriptionManager import SAMPLE_RATE, TranscriptionManager, _dispatch, _resample
+
+
+def _segment(start: float, end: float, text: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=1, start=start, end=end, text=text, avg_logprob=-0.1, no_speech_prob=0.0, words=None
+    )
+
+
+class TestTranscriptionManager(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        # Stub the model so no weights are downloaded or loaded
+        self.whisper_model = MagicMock()
+        self.pipeline = MagicMock()
+        for target, mock in [
+            ("src.managers.TranscriptionManager.download_model", MagicMock(return_value="model-dir")),
+            ("src.managers.TranscriptionManager.WhisperModel", self.whisper_model),
+            ("src.managers.TranscriptionManager.BatchedInferencePipeline", MagicMock(return_value=self.pipeline)),
+            (
+                "src.managers.TranscriptionManager.decode_audio",
+                MagicMock(return_value=np.zeros(SAMPLE_RATE, dtype=np.float32))
+            ),
+        ]:
+            patcher = patch(target, mock)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.manager = TranscriptionManager()
+        self.addCleanup(self._cancel_idle_unload)
+
+    def _cancel_idle_unload(self):
+        if self.manager._idle_unload_handle:
+            self.manager._idle_unload_handle.cancel()
+
+    def test_segment_to_dict(self):
+        segment = _segment(1.0, 2.0, " hello")
+        segment.words = [SimpleNamespace(word=" hello", start=1.0, end=1.5, probability=0.9)]
+
+        self.assertEqual(TranscriptionManager._segment_to_dict(segment), {
+            "id": 1,
+            "start": 1.0,
+            "end": 2.0,
+            "text": " hello",
+            "avg_logprob": -0.1,
+            "no_speech_prob": 0.0,
+            "words": [{"word": " hello", "start": 1.0, "end": 1.5, "probability": 0.9}],
+        })
+
+    async def test_model_is_loaded_on_first_transcription(self):
+        self.pipeline.transcribe.side_effect = lambda *args, **kwargs: (iter([]), SimpleNamespace(language="en"))
+        samples = np.zeros(SAMPLE_RATE, dtype=np.float32)
+        self.whisper_model.assert_not_called()
+
+        await self.manager.transcribe_array(samples)
+        await self.manager.transcribe_array(samples)
+
+        self.whisper_model.assert_called_once()
+
+    @patch("src.managers.TranscriptionManager.DEVICE", "cuda")
+    async def test_falls_back_to_cpu_when_cuda_fails(self):
+        self.whisper_model.side_effect = [RuntimeError("libcublas.so.12 not found"), MagicMock()]
+        self.pipeline.transcribe.return_value = (iter([]), SimpleNamespace(language="en"))
+
+        await self.manager.transcribe_array(np.zeros(SAMPLE_RATE, dtype=np.float32))
+
+        self.assertEqual(self.whisper_model.call_args.kwargs["device"], "cpu")
+        self.assertEqual(self.whisper_model.call_args.kwargs["compute_type"], "int8")
+        self.assertEqual(self.manager._device, "cpu")
+
+    @patch("threading.excepthook", MagicMock())  # The failed loading thread re-raises the error
+    async def test_failed_load_is_retried_on_next_transcription(self):
+        self.whisper_model.side_effect = [RuntimeError("model not found"), MagicMock()]
+        self.pipeline.transcribe.return_value = (iter([]), SimpleNamespace(language="en"))
+        samples = np.zeros(SAMPLE_RATE, dtype=np.float32)
+
+        with self.assertRaises(RuntimeError):
+            await self.manager.transcribe_array(samples)
+        self.assertIsNotNone(await self.manager.transcribe_array(samples))
+        self.assertEqual(self.whisper_model.call_count, 2)
+
+    def _stub_cuda_model(self) -> MagicMock:
+        model = self.whisper_model.return_value
+        model.model.n_mels = 128
+        model.feature_extractor.nb_max_frames = 1
+        model.model.model_is_loaded = True
+        model.model.unload_model.side_effect = lambda to_cpu: setattr(model.model, "model_is_loaded", False)
+        model.model.load_model.side_effect = lambda: setattr(model.model, "model_is_loaded", True)
+        return model
+
+    @patch("src.managers.TranscriptionManager.MODEL_IDLE_TIMEOUT_S", 0)
+    async def test_model_is_unloaded_when_idle(self):
+        self.pipeline.transcribe.side_effect = lambda *args, **kwargs: (iter([]), SimpleNamespace(language="en"))
+        samples = np.zeros(SAMPLE_RATE, dtype=np.float32)
+
+        await self.manager.transcribe_array(samples)
+        await asyncio.sleep(0.05)
+        self.assertIsNone(self.manager._model)
+
+        await self.manager.transcribe_array(samples)
+        self.assertEqual(self.whisper_model.call_count, 2)
+
+    @patch("src.managers.TranscriptionManager.DEVICE", "cuda")
+    @patch("src.managers.TranscriptionManager.MODEL_IDLE_TIMEOUT_S", 0)
+    async def test_cuda_model_is_restored_from_host_memory(self):
+        model = self._stub_cuda_model()
+        self.pipeline.transcribe.side_effect = lambda *args, **kwargs: (iter([]), SimpleNamespace(language="en"))
+        samples = np.zeros(SAMPLE_RATE, dtype=np.float32)
+
+        await self.manager.transcribe_array(samples)
+        await asyncio.sleep(0.05)
+        model.model.unload_model.assert_called_once_with(to_cpu=True)
+        self.assertIs(self.manager._model, model)
+
+        await self.manager.transcribe_array(samples)
+        model.model.load_model.assert_called_once()
+        self.whisper_model.assert_called_once()
+
+    @patch("src.managers.TranscriptionManager.DEVICE", "cuda")
+    @patch("src.managers.TranscriptionManager.MODEL_IDLE_TIMEOUT_S", 0)
+    @patch("src.managers.TranscriptionManager.MODEL_HOST_COPY_TIMEOUT_S", 0)
+    async def test_host_copy_is_dropped_when_idle_longer(self):
+        self._stub_cuda_model()
+        self.pipeline.transcribe.return_value = (iter([]), SimpleNamespace(language="en"))
+
+        await self.manager.transcribe_array(np.zeros(SAMPLE_RATE, dtype=np.float32))
+        await asyncio.sleep(0.05)
+
+        self.assertIsNone(self.manager._model)
+
+    async def test_superseded_videos_resolve_to_none(self):
+        self.manager._transcribe_video = AsyncMock(return_value={"text": "latest"})
+
+        first = self.manager._enqueue("first.mp4")
+        second = self.manager._enqueue("second.mp4")
+
+        self.assertIsNone(await first)
+        self.assertEqual(await second, {"text": "latest"})
+        self.manager._transcribe_video.assert_awaited_once_with("second.mp4")
+
+    @patch("src.managers.TranscriptionManager.extract_audio")
+    async def test_new_video_cancels_running_extraction(self, extract_audio):
+        extraction_started = asyncio.Event()
+
+        async def extract(video_path, sample_rate):
+            if video_path == "first.mp4":
+                extraction_started.set()
+                await asyncio.Event().wait()  # Never finishes unless cancelled
+            return "audio.wav"
+
+        extract_audio.side_effect = extract
+        self.pipeline.transcribe.return_value = (iter([]), SimpleNamespace(language="en"))
+        self.manager._current_video_path = "first.mp4"
+        first = self.manager._enqueue("first.mp4")
+        await extraction_started.wait()
+        self.manager._current_video_path = "second.mp4"
+        second = self.manager._enqueue("second.mp4")
+
+        self.assertIsNone(await asyncio.wait_for(first, 1))
+        self.assertIsNotNone(await asyncio.wait_for(second, 1))
+
+    @patch("src.managers.TranscriptionManager.extract_audio", AsyncMock(return_value="audio.wav"))
+    async def test_failed_video_is_logged_once(self):
+        self.pipeline.transcribe.side_effect = ValueError("decode failed")
+
+        with self.assertLogs(level="ERROR") as logs:
+            self.manager.on_video_changed("video.mp4")
+            await self.manager._pending_task
+            # An unretrieved future exception is reported when the future is collected
+            gc.collect()
+
+        self.assertEqual(len(logs.records), 1)
+
+    async def test_partial_segments_stream_before_final_transcription(self):
+        self.pipeline.transcribe.return_value = (
+            iter([_segment(i, i + 1, f" word{i}") for i in range(3)]),
+            SimpleNamespace(language="en"),
+        )
+        events = []
+        self.manager.add_partial_transcription_listener(
+            lambda partial: events.append(("partial", partial["audio_path"], partial["segment"]["id"]))
+        )
+        self.manager.add_transcription_listener(lambda transcription: events.append(("final", transcription["text"])))
+        self.manager._current_audio_path = "audio.wav"
+
+        transcription = await self.manager.transcribe("audio.wav")
+
+        self.assertEqual(transcription["text"], " word0 word1 word2")
+        self.assertEqual(events, [
+            ("partial", "audio.wav", 1),
+            ("partial", "audio.wav", 2),
+            ("partial", "audio.wav", 3),
+            ("final", " word0 word1 word2"),
+        ])
+
+    async def test_stale_transcription_stops_decoding(self):
+        decoded = []
+
+        def segments():
+            decoded.append("first")
+            yield _segment(0.0, 1.0, " first")
+            self.manager._current_audio_path = "other.wav"
+            decoded.append("second")
+            yield _segment(1.0, 2.0, " second")
+            decoded.append("third")
+            yield _segment(2.0, 3.0, " third")
+
+        self.pipeline.transcribe.return_value = (segments(), SimpleNamespace(language="en"))
+        listener = AsyncMock()
+        self.manager.add_transcription_listener(listener)
+        self.manager._current_audio_path = "audio.wav"
+
+        self.assertIsNone(await self.manager.transcribe("audio.wav"))
+        self.assertEqual(decoded, ["first", "second"])
+        listener.assert_not_called()
+
+    @patch("src.managers.TranscriptionManager.DECODE_WINDOW_S", 1)
+    async def test_long_audio_is_decoded_in_windows(self):
+        self.pipeline.transcribe.side_effect = [
+            (iter([_segment(0.0, 0.5, " first")]), SimpleNamespace(language="en")),
+            (iter([_segment(0.0, 0.5, " second")]), SimpleNamespace(language="en")),
+        ]
+
+        transcription = await self.manager.transcribe_array(np.zeros(SAMPLE_RATE * 3 // 2, dtype=np.float32))
+
+        self.assertEqual(self.pipeline.transcribe.call_count, 2)
+        # The language detected on the first window is reused for the next ones
+        self.assertEqual(self.pipeline.transcribe.call_args.kwargs["language"], "en")
+        self.assertEqual(
+            [(segment["id"], segment["start"]) for segment in transcription["segments"]], [(1, 0.0), (2, 1.0)]
+        )
+
+    @patch("src.managers.TranscriptionManager.DECODE_WINDOW_S", 1)
+    async def test_stale_transcription_skips_remaining_windows(self):
+        def segments():
+            yield _segment(0.0, 0.5, " first")
+            self.manager._current_audio_path = "other.wav"
+
+        self.pipeline.transcribe.return_value = (segments(), SimpleNamespace(language="en"))
+        self.manager._current_audio_path = "audio.wav"
+
+        with patch(
+            "src.managers.TranscriptionManager.decode_audio",
+            MagicMock(return_value=np.zeros(SAMPLE_RATE * 2, dtype=np.float32))
+        ):
+            self.assertIsNone(await self.manager.transcribe("audio.wav"))
+        self.pipeline.transcribe.assert_called_once()
+
+
+
+class TestDispatch(unittest.IsolatedAsyncioTestCase):
+    async def test_calls_plain_and_coroutine_listeners(self):
+        plain = MagicMock()
+        coroutine = AsyncMock()
+
+        await _dispatch([plain, coroutine], "payload")
+
+        plain.assert_called_once_with("payload")
+        coroutine.assert_awaited_once_with("payload")
+
+    async def test_raising_plain_listener_leaves_no_coroutine_unawaited(self):
+        coroutine = AsyncMock()
+
+        with self.assertRaises(ValueError):
+            await _dispatch([coroutine, MagicMock(side_effect=ValueError)], "payload")
+
+        coroutine.assert_not_called()
+
+
+
+class TestResample(unittest.TestCase):
+    def test_resamples_to_target_rate(self):
+        samples = np.zeros(48000, dtype=np.float32)
+
+        resampled = _resample(samples, 48000, 16000)
+
+        self.assertEqual(resampled.dtype, np.float32)
+        self.assertAlmostEqual(len(resampled), 16000, delta=32)
+
+    def test_empty_input(self):
+        resampled = _resample(np.zeros(0, dtype=np.float32), 48000, 16000)
+
+        self.assertEqual(len(resampled), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()